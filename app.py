@@ -15,15 +15,115 @@ TCC: USO DE TRANSCRIÇÃO DE ÁUDIO PARA TRADUÇÃO DINÂMICA DE IDIOMAS COM MOD
 """
 
 import gradio as gr
-from typing import Tuple, Optional
+from typing import AsyncIterator, List, Tuple
+import asyncio
+import atexit
+import functools
+import gc
+import hashlib
+import io
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+import warnings
 import os
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from types import MappingProxyType
+
+import ctranslate2
+import numpy as np
+from faster_whisper import WhisperModel, BatchedInferencePipeline, decode_audio
+from faster_whisper.utils import download_model
+from deep_translator import GoogleTranslator, MyMemoryTranslator
+
+from utilidades import (
+    CacheLRU,
+    chave_traducao,
+    codigo_do_whisper,
+    codigo_para_whisper,
+    TAXA_AMOSTRAGEM,
+    adicionar_trecho,
+    converter_para_16k,
+    cpus_disponiveis,
+    dividir_texto,
+    janela_pendente,
+    novo_estado_microfone,
+    registrar_janela,
+)
 
-# Importa o sistema integrado
-from main import SistemaTranscricaoTraducao
+# Disco persistente do Hugging Face Spaces (/data), quando habilitado. O cache
+# do container é efêmero; guardar os modelos aqui evita baixá-los a cada cold start.
+DIRETORIO_PERSISTENTE = "/data" if os.path.isdir("/data") else None
+
+# Pesos do Whisper (CTranslate2) baixados do Hugging Face Hub
+DIRETORIO_MODELOS_WHISPER = (
+    os.path.join(DIRETORIO_PERSISTENTE, "whisper") if DIRETORIO_PERSISTENTE else None
+)
+
+warnings.filterwarnings("ignore", category=UserWarning)
 
+# Logging assíncrono: a thread da requisição apenas enfileira o registro e
+# um QueueListener em segundo plano faz a escrita no terminal
+logger = logging.getLogger("tcc")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_fila_logs = queue.SimpleQueue()
+_saida_logs = logging.StreamHandler()
+_saida_logs.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+logger.addHandler(logging.handlers.QueueHandler(_fila_logs))
+_ouvinte_logs = logging.handlers.QueueListener(_fila_logs, _saida_logs)
+_ouvinte_logs.start()
+atexit.register(_ouvinte_logs.stop)
 
-# Cache global do sistema (evita recarregar modelo a cada uso)
-_sistema_cache = {}
+
+class _CacheModelos:
+    """
+    Cache LRU dos modelos carregados, limitado a `capacidade` entradas.
+    Ao atingir o limite, descarta o modelo usado há mais tempo, liberando
+    sua memória (RAM/VRAM) antes de carregar o próximo.
+    """
+    
+    def __init__(self, capacidade: int):
+        self.capacidade = max(1, capacidade)
+        self._modelos = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._modelos)
+    
+    def get(self, chave):
+        """Retorna o modelo (ou None) e o marca como o mais recente"""
+        with self._lock:
+            modelo = self._modelos.get(chave)
+            if modelo is not None:
+                self._modelos.move_to_end(chave)
+            return modelo
+    
+    def liberar_espaco(self):
+        """Descarta os modelos mais antigos até haver espaço para um novo"""
+        with self._lock:
+            descartados = []
+            while len(self._modelos) >= self.capacidade:
+                descartados.append(self._modelos.popitem(last=False)[0])
+        for chave in descartados:
+            logger.info(f"🗑️ Modelo {chave} removido do cache")
+        if descartados:
+            # O CTranslate2 libera a memória (RAM/VRAM) ao destruir o modelo
+            gc.collect()
+    
+    def put(self, chave, modelo):
+        """Adiciona o modelo ao cache, descartando o mais antigo se necessário"""
+        self.liberar_espaco()
+        with self._lock:
+            self._modelos[chave] = modelo
+
+
+# Cache de modelos (WHISPER_MAX_MODELOS modelos residentes, 2 por padrão)
+CAPACIDADE_CACHE_MODELOS = int(os.getenv("WHISPER_MAX_MODELOS", "2"))
+_modelos_cache = _CacheModelos(CAPACIDADE_CACHE_MODELOS)
 
 # Mapeamento de níveis de qualidade para modelos Whisper
 QUALIDADE_PARA_MODELO = {
@@ -34,8 +134,8 @@ QUALIDADE_PARA_MODELO = {
     "Máxima Qualidade": "large"
 }
 
-# Mapeamento de idiomas (nome completo -> código)
-IDIOMAS = {
+# Mapeamento de idiomas (somente leitura, compartilhado pelos componentes da interface)
+IDIOMAS = MappingProxyType({
     "Detecção Automática": "auto",
     "Português": "pt",
     "Inglês": "en",
@@ -48,476 +148,556 @@ IDIOMAS = {
     "Chinês (Simplificado)": "zh-CN",
     "Russo": "ru",
     "Árabe": "ar"
-}
+})
+
+IDIOMAS_DESTINO = MappingProxyType({k: v for k, v in IDIOMAS.items() if k != "Detecção Automática"})
+
+# Mapeamento reverso (código -> nome do idioma)
+CODIGO_PARA_IDIOMA = MappingProxyType({v: k for k, v in IDIOMAS.items()})
+
+# Opções dos controles da interface (montadas uma única vez e compartilhadas entre as abas)
+_QUALIDADES = list(QUALIDADE_PARA_MODELO.keys())
+_IDIOMAS_KEYS = list(IDIOMAS.keys())
+_IDIOMAS_DESTINO_KEYS = list(IDIOMAS_DESTINO.keys())
+
+# Tamanho (em segundos) da janela transcrita durante a gravação pelo microfone
+JANELA_MICROFONE = 5
+
+# Duração máxima (em segundos) de uma gravação pelo microfone; o áudio que
+# passar disso é descartado (cerca de 38 MB de amostras float32 a 16 kHz)
+DURACAO_MAXIMA_GRAVACAO = 10 * 60
+
+# Durante a transcrição, a tradução parcial é refeita a cada N segmentos
+# (evita uma chamada ao Google Translate por segmento)
+SEGMENTOS_POR_TRADUCAO = 10
+
+# Tamanho máximo (em caracteres) de cada requisição aos serviços de tradução
+LIMITE_CARACTERES_GOOGLE = 4500
+LIMITE_CARACTERES_MYMEMORY = 500
 
-# Idiomas de destino (sem opção de auto-detecção)
-IDIOMAS_DESTINO = {k: v for k, v in IDIOMAS.items() if k != "Detecção Automática"}
+# Textos maiores que isso (em caracteres) não entram no cache de tradução
+LIMITE_TEXTO_CACHE = 4096
 
 
-def obter_sistema(modelo_whisper: str) -> SistemaTranscricaoTraducao:
+def memoria_total_gb() -> float:
+    """Retorna a memória RAM total da máquina em GB (0 se não for possível obter)"""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024 ** 3
+    except (ValueError, OSError, AttributeError):
+        return 0.0
+
+
+def tamanho_lote_padrao() -> int:
+    """Sugere o tamanho do lote de transcrição de acordo com a RAM disponível"""
+    memoria = memoria_total_gb()
+    if memoria >= 16:
+        return 16
+    if memoria >= 8:
+        return 8
+    return 4
+
+
+# Limites do controle de tamanho do lote na interface
+TAMANHO_LOTE_MAXIMO = 32
+TAMANHO_LOTE_PADRAO = tamanho_lote_padrao()
+
+
+def flags_cpu() -> set:
+    """Lê as extensões de instrução da CPU em /proc/cpuinfo (vazio fora do Linux)"""
+    try:
+        with open("/proc/cpuinfo") as arquivo:
+            for linha in arquivo:
+                if linha.startswith("flags"):
+                    return set(linha.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return set()
+
+
+def escolher_compute_type() -> str:
     """
-    Obtém ou cria uma instância do sistema com o modelo especificado.
-    Usa cache para evitar recarregar o modelo desnecessariamente.
+    Escolhe o tipo de computação do CTranslate2 conforme a CPU:
+    - int8: CPUs com VNNI (AVX-512 VNNI / AVX-VNNI), GEMMs int8 nativas
+    - int8_float32: CPUs com AVX2, pesos int8 e demais operações em float32
+    - float32: CPUs antigas, sem ganho com quantização
     """
-    if modelo_whisper not in _sistema_cache:
-        print(f"🔄 Carregando sistema com modelo '{modelo_whisper}'...")
-        _sistema_cache[modelo_whisper] = SistemaTranscricaoTraducao(modelo_whisper=modelo_whisper)
-    return _sistema_cache[modelo_whisper]
+    flags = flags_cpu()
+    if not flags or "avx512_vnni" in flags or "avx_vnni" in flags:
+        return "int8"
+    if "avx2" in flags:
+        return "int8_float32"
+    return "float32"
 
 
-def processar_arquivo_audio(
-    arquivo_audio,
-    qualidade: str,
-    idioma_origem: str,
-    idioma_destino: str,
-    traduzir: bool
-) -> Tuple[str, str, str]:
+COMPUTE_TYPE_CPU = escolher_compute_type()
+
+# Número de transcrições executadas ao mesmo tempo (WHISPER_WORKERS).
+# Também define os workers do CTranslate2, que compartilham uma única
+# cópia do modelo na memória (RAM/VRAM).
+NUM_WORKERS = max(1, int(os.getenv("WHISPER_WORKERS", "2")))
+
+# Threads do CTranslate2 por worker na CPU: os núcleos são divididos entre os
+# workers (o padrão do CTranslate2 são 4 threads, independente da máquina)
+THREADS_CPU = max(1, cpus_disponiveis() // NUM_WORKERS)
+
+# Protege o carregamento dos modelos (evita cargas duplicadas entre threads)
+_cache_lock = threading.Lock()
+# Limita as inferências simultâneas para não disputar CPU/cache entre requisições
+_inferencia_sem = threading.Semaphore(NUM_WORKERS)
+
+# Máximo de requisições aguardando na fila do Gradio
+TAMANHO_MAXIMO_FILA = int(os.getenv("GRADIO_MAX_FILA", "16"))
+
+
+def escolher_dispositivo() -> str:
     """
-    Processa arquivo de áudio enviado pelo usuário.
-    
-    Returns:
-        Tuple contendo:
-        - Texto transcrito
-        - Texto traduzido (ou mensagem se não traduzir)
-        - Informações adicionais
+    Usa CUDA quando há GPU disponível, senão CPU.
+    A variável de ambiente WHISPER_DEVICE (ex.: WHISPER_DEVICE=cpu) força o dispositivo.
     """
-    if arquivo_audio is None:
-        return "❌ Nenhum arquivo foi enviado.", "", ""
-    
+    dispositivo = os.getenv("WHISPER_DEVICE")
+    if dispositivo:
+        return dispositivo
     try:
-        # Converte qualidade para modelo Whisper
-        modelo_whisper = QUALIDADE_PARA_MODELO[qualidade]
-        
-        # Converte nome do idioma para código
-        codigo_idioma_destino = IDIOMAS_DESTINO[idioma_destino]
-        codigo_idioma_origem = IDIOMAS.get(idioma_origem)
-        
-        # Se não for auto-detecção, usa o idioma especificado
-        idioma_origem_transcricao = None if codigo_idioma_origem == "auto" else codigo_idioma_origem
-        
-        # Obtém o sistema com o modelo escolhido
-        sistema = obter_sistema(modelo_whisper)
-        
-        # Processa a transcrição
-        if idioma_origem_transcricao:
-            resultado_transcricao = sistema.transcritor.transcrever_arquivo(
-                arquivo_audio,
-                idioma=idioma_origem_transcricao
-            )
-            resultado = {
-                'arquivo': resultado_transcricao['arquivo'],
-                'transcricao': resultado_transcricao,
-                'traducao': None
-            }
-        else:
-            resultado = sistema.processar_audio(
-                caminho_audio=arquivo_audio,
-                idioma_destino=codigo_idioma_destino,
-                traduzir=False  # Vamos traduzir separadamente
-            )
-        
-        # Extrai informações
-        texto_transcrito = resultado['transcricao']['texto']
-        idioma_detectado = resultado['transcricao']['idioma']
-        
-        # Traduz se solicitado
-        if traduzir:
-            traducao_resultado = sistema.tradutor.traduzir(
-                texto=texto_transcrito,
-                idioma_destino=codigo_idioma_destino,
-                idioma_origem=idioma_detectado
-            )
-            texto_traduzido = traducao_resultado['texto_traduzido']
-            servico = traducao_resultado['servico']
-            
-            # Encontra o nome do idioma detectado
-            nome_idioma = next((k for k, v in IDIOMAS.items() if v == idioma_detectado), idioma_detectado)
-            info = f"🌐 Idioma detectado: {nome_idioma}\n📝 Serviço de tradução: {servico}"
-        else:
-            texto_traduzido = "✅ Tradução não solicitada."
-            nome_idioma = next((k for k, v in IDIOMAS.items() if v == idioma_detectado), idioma_detectado)
-            info = f"🌐 Idioma detectado: {nome_idioma}"
-        
-        return texto_transcrito, texto_traduzido, info
-        
-    except Exception as e:
-        print(f"❌ Erro ao processar áudio: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return f"❌ Erro ao processar áudio: {str(e)}", "", ""
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    except Exception:
+        return "cpu"
 
 
-def processar_microfone(
-    audio_gravado,
-    qualidade: str,
-    idioma_origem: str,
-    idioma_destino: str,
-    traduzir: bool
-) -> Tuple[str, str, str]:
+DISPOSITIVO = escolher_dispositivo()
+
+
+def escolher_compute_type_gpu() -> str:
     """
-    Processa áudio gravado pelo microfone.
-    
-    Returns:
-        Tuple contendo:
-        - Texto transcrito
-        - Texto traduzido (ou mensagem se não traduzir)
-        - Informações adicionais
+    Escolhe o tipo de computação do CTranslate2 para a GPU:
+    int8_float16 quando a placa suporta (Tensor Cores), senão float16.
     """
-    if audio_gravado is None:
-        return "❌ Nenhuma gravação detectada.", "", ""
-    
     try:
-        # Usa a mesma função de processamento de arquivo
-        return processar_arquivo_audio(
-            audio_gravado,
-            qualidade,
-            idioma_origem,
-            idioma_destino,
-            traduzir
-        )
-        
-    except Exception as e:
-        print(f"❌ Erro ao processar gravação: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return f"❌ Erro ao processar gravação: {str(e)}", "", ""
+        suportados = ctranslate2.get_supported_compute_types("cuda")
+    except Exception:
+        return "float16"
+    if "int8_float16" in suportados:
+        return "int8_float16"
+    if "float16" in suportados:
+        return "float16"
+    return "float32"
 
 
-def criar_interface():
-    """Cria e configura a interface Gradio"""
+COMPUTE_TYPE_GPU = escolher_compute_type_gpu() if DISPOSITIVO == "cuda" else None
+
+
+def caminho_modelo_whisper(modelo: str) -> str:
+    """
+    Resolve o diretório local do modelo. Se ele já foi baixado, usa a cópia
+    local sem consultar o Hugging Face Hub; caso contrário, faz o download.
+    """
+    try:
+        return download_model(modelo, local_files_only=True, cache_dir=DIRETORIO_MODELOS_WHISPER)
+    except (FileNotFoundError, ValueError):
+        return download_model(modelo, cache_dir=DIRETORIO_MODELOS_WHISPER)
+
+
+def carregar_modelo_whisper(modelo: str):
+    """
+    Carrega e cacheia o modelo Whisper (faster-whisper / CTranslate2) já
+    envolvido em um BatchedInferencePipeline, que transcreve vários trechos
+    de fala do mesmo áudio em um único lote.
+    Na GPU usa int8_float16 (ou float16); se o carregamento em CUDA falhar,
+    recorre à CPU com o compute_type escolhido para o processador.
+    """
+    # A chave inclui dispositivo e compute_type para que variantes CPU/GPU coexistam
+    if DISPOSITIVO == "cuda":
+        chave = (modelo, "cuda", COMPUTE_TYPE_GPU)
+    else:
+        chave = (modelo, "cpu", COMPUTE_TYPE_CPU)
     
-    # Tema customizado
-    tema = gr.themes.Soft(
-        primary_hue="blue",
-        secondary_hue="cyan",
-    )
+    # Caminho rápido: modelo já carregado, sem disputar a trava de carregamento
+    pipeline = _modelos_cache.get(chave)
+    if pipeline is not None:
+        return pipeline
     
-    with gr.Blocks(theme=tema, title="Transcrição e Tradução de Áudio") as interface:
-        
-        # Cabeçalho centralizado
-        gr.HTML("""
-        <div style="text-align: center; width: 100%; margin: 20px auto;">
-            <h1 style="margin: 0;">🎙️ Sistema de Transcrição e Tradução de Áudio</h1>
-            <h3 style="margin: 10px 0; font-weight: normal;">Ferramenta para transcrição automática de áudio usando Whisper e tradução com Google Translate</h3>
-        </div>
-        """)
-        
-        gr.Markdown("---")
-        
-        # Informações sobre o projeto
-        with gr.Accordion("ℹ️ Sobre o Projeto", open=False):
-            gr.Markdown("""
-            ### TCC: Uso de Transcrição de Áudio para Tradução Dinâmica de Idiomas com Modelos de IA LLM
-            
-            **Autor:** João Vítor Arruda Percinotto
+    with _cache_lock:
+        pipeline = _modelos_cache.get(chave)
+        if pipeline is None:
+            # Descarta o modelo mais antigo antes de carregar o novo,
+            # evitando ter três modelos na memória ao mesmo tempo
+            _modelos_cache.liberar_espaco()
             
-            **Descrição:** Sistema desenvolvido para transcrever automaticamente áudios em diversos idiomas 
-            usando o modelo Whisper da OpenAI e realizar traduções em tempo real utilizando Google Translate.
+            caminho = caminho_modelo_whisper(modelo)
+            modelo_whisper = None
+            if DISPOSITIVO == "cuda":
+                logger.info(f"🔄 Carregando modelo Whisper '{modelo}' (cuda, {COMPUTE_TYPE_GPU})...")
+                try:
+                    modelo_whisper = WhisperModel(
+                        caminho,
+                        device="cuda",
+                        compute_type=COMPUTE_TYPE_GPU,
+                        num_workers=NUM_WORKERS
+                    )
+                except (RuntimeError, ValueError) as e:
+                    logger.warning(f"⚠️ Não foi possível usar a GPU ({e}); usando CPU.")
             
-            **Recursos:**
-            - ✅ Transcrição de áudio em 12+ idiomas
-            - ✅ Tradução automática entre idiomas
-            - ✅ Upload de arquivos de áudio
-            - ✅ Gravação via microfone (recomendado Chrome/Edge)
-            - ✅ Múltiplos níveis de qualidade de transcrição
-            
-            **Formatos de áudio suportados:** MP3, WAV, OPUS, M4A, FLAC, OGG, WMA
-            """)
-        
-        # Aviso sobre compatibilidade de navegadores
-        gr.Markdown("""
-        ℹ️ **Nota:** Para melhor experiência com a gravação via microfone, 
-        use **Google Chrome** ou **Microsoft Edge**.
-        """)
-        
-        # Abas para diferentes modos
-        with gr.Tabs():
-            
-            # === ABA 1: UPLOAD DE ARQUIVO ===
-            with gr.Tab("📁 Upload de Arquivo"):
-                gr.Markdown("### Envie um arquivo de áudio para transcrever e traduzir")
-                
-                with gr.Row():
-                    with gr.Column(scale=1):
-                        # Inputs
-                        arquivo_input = gr.Audio(
-                            label="Arquivo de Áudio (MP3, WAV, OPUS, M4A, FLAC, OGG, WMA)",
-                            type="filepath",
-                            sources=["upload"]
-                        )
-                        
-                        qualidade_arquivo = gr.Radio(
-                            choices=["Muito Rápida", "Rápida", "Balanceada", "Alta Qualidade", "Máxima Qualidade"],
-                            value="Balanceada",
-                            label="Nível de Qualidade da Transcrição",
-                            info="Quanto maior a qualidade, mais lenta e precisa será a transcrição"
-                        )
-                        
-                        idioma_origem_arquivo = gr.Dropdown(
-                            choices=list(IDIOMAS.keys()),
-                            value="Detecção Automática",
-                            label="Idioma do Áudio (Opcional)",
-                            info="Deixe em 'Detecção Automática' se não souber o idioma"
-                        )
-                        
-                        idioma_destino_arquivo = gr.Dropdown(
-                            choices=list(IDIOMAS_DESTINO.keys()),
-                            value="Inglês",
-                            label="Idioma de Destino para Tradução",
-                            info="Idioma para o qual o texto será traduzido"
-                        )
-                        
-                        traduzir_arquivo = gr.Checkbox(
-                            value=True,
-                            label="Traduzir texto transcrito",
-                            info="Desmarque para apenas transcrever (sem tradução)"
-                        )
-                        
-                        btn_processar_arquivo = gr.Button(
-                            "🚀 Processar Arquivo",
-                            variant="primary",
-                            size="lg"
-                        )
-                    
-                    with gr.Column(scale=1):
-                        # Outputs
-                        transcricao_arquivo = gr.Textbox(
-                            label="📝 Texto Transcrito",
-                            lines=8,
-                            max_lines=15,
-                            show_copy_button=True
-                        )
-                        
-                        traducao_arquivo = gr.Textbox(
-                            label="🌍 Texto Traduzido",
-                            lines=8,
-                            max_lines=15,
-                            show_copy_button=True
-                        )
-                        
-                        info_arquivo = gr.Textbox(
-                            label="ℹ️ Informações",
-                            lines=2
-                        )
-                
-                # Conecta o botão à função
-                btn_processar_arquivo.click(
-                    fn=processar_arquivo_audio,
-                    inputs=[arquivo_input, qualidade_arquivo, idioma_origem_arquivo, idioma_destino_arquivo, traduzir_arquivo],
-                    outputs=[transcricao_arquivo, traducao_arquivo, info_arquivo]
+            if modelo_whisper is None:
+                logger.info(f"🔄 Carregando modelo Whisper '{modelo}' (cpu, {COMPUTE_TYPE_CPU})...")
+                modelo_whisper = WhisperModel(
+                    caminho,
+                    device="cpu",
+                    compute_type=COMPUTE_TYPE_CPU,
+                    cpu_threads=THREADS_CPU,
+                    num_workers=NUM_WORKERS
                 )
             
-            # === ABA 2: GRAVAÇÃO VIA MICROFONE ===
-            with gr.Tab("🎤 Gravar Microfone"):
-                gr.Markdown("### Grave sua voz diretamente pelo navegador")
-                gr.Markdown("""
-                **📝 Como usar:**
-                1. Clique no ícone do microfone para começar a gravar
-                2. Fale claramente
-                3. Clique novamente para parar a gravação
-                4. Clique no botão "🚀 Processar Gravação"
-                
-                **⚠️ Problemas com o microfone?**
-                - Verifique se o navegador tem permissão para acessar o microfone
-                - Use preferencialmente Chrome ou Edge
-                """)
-                
-                with gr.Row():
-                    with gr.Column(scale=1):
-                        # Inputs
-                        microfone_input = gr.Audio(
-                            label="Gravação de Áudio",
-                            type="filepath",
-                            sources=["microphone"]
-                        )
-                        
-                        qualidade_mic = gr.Radio(
-                            choices=["Muito Rápida", "Rápida", "Balanceada", "Alta Qualidade", "Máxima Qualidade"],
-                            value="Balanceada",
-                            label="Nível de Qualidade da Transcrição",
-                            info="Quanto maior a qualidade, mais lenta e precisa será a transcrição"
-                        )
-                        
-                        idioma_origem_mic = gr.Dropdown(
-                            choices=list(IDIOMAS.keys()),
-                            value="Detecção Automática",
-                            label="Idioma do Áudio (Opcional)",
-                            info="Deixe em 'Detecção Automática' se não souber o idioma"
-                        )
-                        
-                        idioma_destino_mic = gr.Dropdown(
-                            choices=list(IDIOMAS_DESTINO.keys()),
-                            value="Português",
-                            label="Idioma de Destino para Tradução",
-                            info="Idioma para o qual o texto será traduzido"
-                        )
-                        
-                        traduzir_mic = gr.Checkbox(
-                            value=True,
-                            label="Traduzir texto transcrito",
-                            info="Desmarque para apenas transcrever (sem tradução)"
-                        )
-                        
-                        btn_processar_mic = gr.Button(
-                            "🚀 Processar Gravação",
-                            variant="primary",
-                            size="lg"
-                        )
-                    
-                    with gr.Column(scale=1):
-                        # Outputs
-                        transcricao_mic = gr.Textbox(
-                            label="📝 Texto Transcrito",
-                            lines=8,
-                            max_lines=15,
-                            show_copy_button=True
-                        )
-                        
-                        traducao_mic = gr.Textbox(
-                            label="🌍 Texto Traduzido",
-                            lines=8,
-                            max_lines=15,
-                            show_copy_button=True
-                        )
-                        
-                        info_mic = gr.Textbox(
-                            label="ℹ️ Informações",
-                            lines=2
-                        )
-                
-                # Conecta o botão à função
-                btn_processar_mic.click(
-                    fn=processar_microfone,
-                    inputs=[microfone_input, qualidade_mic, idioma_origem_mic, idioma_destino_mic, traduzir_mic],
-                    outputs=[transcricao_mic, traducao_mic, info_mic]
-                )
-        
-        # Rodapé
-        gr.Markdown("---")
-        gr.Markdown("""
-        <div style="text-align: center; color: #666; font-size: 0.9em;">
-        
-        **TCC:** Uso de Transcrição de Áudio para Tradução Dinâmica de Idiomas com Modelos de IA LLM  
-        **Autor:** João Vítor Arruda Percinotto
-        
-        </div>
-        """)
-    
-    return interface
+            pipeline = BatchedInferencePipeline(model=modelo_whisper)
+            _modelos_cache.put(chave, pipeline)
+            logger.info(f"✅ Modelo '{modelo}' carregado!")
+    return pipeline
 
 
-# Cria e inicia a interface
-"""
-Interface Web para o Sistema de Transcrição e Tradução
-=======================================================
-Interface gráfica web usando Gradio para o sistema de transcrição
-e tradução automática de áudio.
+def aquecer_modelo_whisper(modelo: str):
+    """
+    Carrega o modelo e executa transcrições descartáveis de 1 s de silêncio
+    pelo mesmo caminho das requisições (modo em lote, sob o semáforo): com o
+    VAD, que carrega o Silero; e sem ele, já que no silêncio o VAD não deixa
+    o Whisper rodar. Assim os kernels do CTranslate2 e os buffers do
+    espectrograma ficam prontos antes da primeira requisição real.
+    """
+    silencio = np.zeros(TAXA_AMOSTRAGEM, dtype=np.float32)
+    for filtro_vad in (True, False):
+        segmentos, _, _ = transcrever_segmentos(silencio, modelo, "en", filtro_vad=filtro_vad)
+        list(segmentos)
 
-Autor: João Vítor Arruda Percinotto
-TCC: USO DE TRANSCRIÇÃO DE ÁUDIO PARA TRADUÇÃO DINÂMICA DE IDIOMAS COM MODELOS DE IA LLM
-"""
 
-import gradio as gr
-from typing import Tuple
-import whisper
-from deep_translator import GoogleTranslator, MyMemoryTranslator
-from langdetect import detect
-import warnings
-import os
+def aquecer_modelos(modelos: List[str]):
+    """Aquece os modelos em sequência; uma falha não impede a interface de subir"""
+    for modelo in modelos:
+        try:
+            aquecer_modelo_whisper(modelo)
+        except Exception:
+            logger.exception(f"❌ Falha ao pré-carregar o modelo '{modelo}'")
 
-warnings.filterwarnings("ignore", category=UserWarning)
 
-# Cache de modelos
-_modelos_cache = {}
+# Áudios decodificados recentemente (hash do arquivo -> amostras 16 kHz mono)
+_audios_cache = OrderedDict()
+_audios_cache_lock = threading.Lock()
+CAPACIDADE_CACHE_AUDIO = 8
+# Áudios mais longos que isso (em segundos) não são guardados no cache
+DURACAO_MAXIMA_CACHE_AUDIO = 15 * 60
 
-# Mapeamento de níveis de qualidade para modelos Whisper
-QUALIDADE_PARA_MODELO = {
-    "Muito Rápida": "tiny",
-    "Rápida": "base",
-    "Balanceada": "small",
-    "Alta Qualidade": "medium",
-    "Máxima Qualidade": "large"
-}
 
-# Mapeamento de idiomas
-IDIOMAS = {
-    "Detecção Automática": "auto",
-    "Português": "pt",
-    "Inglês": "en",
-    "Espanhol": "es",
-    "Francês": "fr",
-    "Alemão": "de",
-    "Italiano": "it",
-    "Japonês": "ja",
-    "Coreano": "ko",
-    "Chinês (Simplificado)": "zh-CN",
-    "Russo": "ru",
-    "Árabe": "ar"
-}
+def carregar_audio(caminho: str) -> Tuple[np.ndarray, bytes]:
+    """
+    Decodifica o arquivo para float32 mono a 16 kHz uma única vez.
+    Retorna (amostras, hash do conteúdo). O resultado é cacheado pelo hash,
+    então cliques repetidos em "Processar" sobre a mesma gravação não
+    decodificam o áudio de novo.
+    """
+    with open(caminho, "rb") as arquivo:
+        conteudo = arquivo.read()
+    chave = hashlib.blake2b(conteudo, digest_size=16).digest()
+    
+    with _audios_cache_lock:
+        if chave in _audios_cache:
+            _audios_cache.move_to_end(chave)
+            return _audios_cache[chave], chave
+    
+    # Decodifica a partir dos bytes já lidos, sem abrir o arquivo de novo
+    audio = decode_audio(io.BytesIO(conteudo), sampling_rate=TAXA_AMOSTRAGEM)
+    
+    if len(audio) <= DURACAO_MAXIMA_CACHE_AUDIO * TAXA_AMOSTRAGEM:
+        with _audios_cache_lock:
+            _audios_cache[chave] = audio
+            if len(_audios_cache) > CAPACIDADE_CACHE_AUDIO:
+                _audios_cache.popitem(last=False)
+    return audio, chave
 
-IDIOMAS_DESTINO = {k: v for k, v in IDIOMAS.items() if k != "Detecção Automática"}
 
+# Transcrições de arquivos já processados, válidas por uma hora
+# ((hash do áudio, modelo, idioma, tarefa) -> (segmentos, idioma detectado, duração))
+CAPACIDADE_CACHE_TRANSCRICOES = 64
+VALIDADE_CACHE_TRANSCRICOES = 60 * 60
+_transcricoes_cache = CacheLRU(CAPACIDADE_CACHE_TRANSCRICOES, VALIDADE_CACHE_TRANSCRICOES)
 
-def carregar_modelo_whisper(modelo: str):
-    """Carrega e cacheia o modelo Whisper"""
-    if modelo not in _modelos_cache:
-        print(f"🔄 Carregando modelo Whisper '{modelo}'...")
-        _modelos_cache[modelo] = whisper.load_model(modelo)
-        print(f"✅ Modelo '{modelo}' carregado!")
-    return _modelos_cache[modelo]
 
+def _segmentos_cacheados(segmentos, chave, idioma_detectado: str, duracao: float):
+    """Repassa os segmentos e, se a transcrição chegar ao fim, guarda-os no cache"""
+    concluidos = []
+    for segmento in segmentos:
+        concluidos.append(segmento)
+        yield segmento
+    _transcricoes_cache.put(chave, (concluidos, idioma_detectado, duracao))
 
-def transcrever_audio(arquivo_audio, modelo_nome: str, idioma: str = None):
-    """Transcreve áudio usando Whisper"""
+
+def _segmentos_limitados(segmentos):
+    """Percorre os segmentos respeitando o limite de inferências simultâneas"""
+    iterador = iter(segmentos)
+    while True:
+        # Cada passo do gerador executa um lote de decodificação
+        with _inferencia_sem:
+            segmento = next(iterador, None)
+        if segmento is None:
+            return
+        yield segmento
+
+
+def transcrever_segmentos(
+    arquivo_audio,
+    modelo_nome: str,
+    idioma: str = None,
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO,
+    tarefa: str = "transcribe",
+    filtro_vad: bool = True
+):
+    """
+    Inicia a transcrição e retorna (gerador de segmentos, idioma detectado,
+    duração do áudio em segundos).
+    Os segmentos são produzidos sob demanda, à medida que o gerador é percorrido.
+    Com tarefa="translate", o próprio Whisper produz o texto em inglês.
+    filtro_vad=False desativa o VAD (usado no aquecimento dos modelos).
+    Arquivos já transcritos com o mesmo modelo, idioma e tarefa são
+    respondidos do cache, sem executar o Whisper de novo.
+    """
+    chave = None
+    if isinstance(arquivo_audio, str):
+        arquivo_audio, hash_audio = carregar_audio(arquivo_audio)
+        chave = (hash_audio, modelo_nome, idioma or "auto", tarefa)
+        em_cache = _transcricoes_cache.get(chave)
+        if em_cache is not None:
+            segmentos, idioma_detectado, duracao = em_cache
+            return iter(segmentos), idioma_detectado, duracao
+    
     modelo = carregar_modelo_whisper(modelo_nome)
     
+    # O VAD (Silero) divide o áudio em trechos de fala de tamanho parecido,
+    # reduzindo o preenchimento desperdiçado em cada lote
+    # Decodificação gulosa sem fallback de temperatura e sem timestamps (a
+    # interface não os exibe): latência menor e previsível para uso interativo
     opcoes = {
-        "fp16": False,
-        "verbose": False
+        "task": tarefa,
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+        "no_speech_threshold": 0.6,
+        "without_timestamps": True,
+        "vad_filter": filtro_vad,
+        # Só corta em pausas de 0,5 s ou mais: trechos mais longos (até 30 s)
+        # e menos itens por lote do que o padrão de 160 ms do modo em lote
+        "vad_parameters": {"min_silence_duration_ms": 500},
+        "batch_size": int(tamanho_lote)
     }
     
     if idioma and idioma != "auto":
-        opcoes["language"] = idioma
+        opcoes["language"] = codigo_para_whisper(idioma)
     
-    resultado = modelo.transcribe(arquivo_audio, **opcoes)
-    return resultado["text"].strip(), resultado.get("language", "desconhecido")
+    with _inferencia_sem:
+        segmentos, info = modelo.transcribe(arquivo_audio, **opcoes)
+    # Normaliza o código (ex.: "zh" -> "zh-CN") para compará-lo com o idioma
+    # de destino e repassá-lo ao tradutor
+    idioma_detectado = codigo_do_whisper(info.language) or "desconhecido"
+    segmentos = _segmentos_limitados(segmentos)
+    if chave is not None:
+        segmentos = _segmentos_cacheados(segmentos, chave, idioma_detectado, info.duration)
+    return segmentos, idioma_detectado, info.duration
 
 
-def traduzir_texto(texto: str, idioma_destino: str, idioma_origem: str = None):
-    """Traduz texto usando Google Translate"""
+def transcrever_audio(
+    arquivo_audio,
+    modelo_nome: str,
+    idioma: str = None,
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO
+):
+    """Transcreve áudio usando Whisper"""
+    segmentos, idioma_detectado, _ = transcrever_segmentos(arquivo_audio, modelo_nome, idioma, tamanho_lote)
+    texto = "".join(segmento.text for segmento in segmentos)
+    return texto.strip(), idioma_detectado
+
+
+@functools.lru_cache(maxsize=32)
+def _obter_tradutor_google(idioma_origem: str, idioma_destino: str):
+    """
+    Reaproveita um GoogleTranslator por par de idiomas.
+    A instância guarda os parâmetros da requisição em atributos, por isso
+    vem acompanhada de uma trava para uso seguro entre threads.
+    """
+    return GoogleTranslator(source=idioma_origem, target=idioma_destino), threading.Lock()
+
+
+# Traduções recentes ((hash do texto, origem, destino) -> (tradução, serviço))
+CAPACIDADE_CACHE_TRADUCOES = 2048
+_traducoes_cache = CacheLRU(CAPACIDADE_CACHE_TRADUCOES)
+
+
+# Tempo (em segundos) que o Google tem, por bloco de texto, para responder
+# antes de a mesma tradução ser pedida também ao MyMemory; vale a resposta
+# que chegar primeiro
+ESPERA_ANTES_MYMEMORY = 2.0
+
+# Tempo máximo (em segundos), por bloco de texto, de uma tradução. O
+# deep-translator não aceita timeout nas requisições, então a espera é
+# limitada aqui e a chamada que passar disso termina em segundo plano
+TEMPO_MAXIMO_TRADUCAO = 30.0
+
+
+def _em_thread(funcao, *args) -> Future:
+    """
+    Executa a função em uma thread própria (daemon) e retorna um Future.
+    Uma requisição travada ou abandonada não ocupa as threads de um pool
+    compartilhado, então não atrasa as traduções seguintes.
+    """
+    futuro = Future()
+    
+    def executar():
+        if not futuro.set_running_or_notify_cancel():
+            return
+        try:
+            futuro.set_result(funcao(*args))
+        except BaseException as e:
+            futuro.set_exception(e)
+    
+    threading.Thread(target=executar, name="traducao", daemon=True).start()
+    return futuro
+
+
+def _traduzir_google(
+    blocos: List[str],
+    idioma_origem: str,
+    idioma_destino: str,
+    iniciado: threading.Event = None
+) -> Tuple[str, str]:
+    """
+    Traduz os blocos com Google Translate, enviados em lote (translate_batch).
+    Espera no máximo TEMPO_MAXIMO_TRADUCAO segundos por bloco pela trava do
+    par de idiomas e sinaliza `iniciado` quando a requisição de fato começa.
+    """
+    tradutor, trava = _obter_tradutor_google(idioma_origem, idioma_destino)
+    if not trava.acquire(timeout=TEMPO_MAXIMO_TRADUCAO * len(blocos)):
+        raise TimeoutError("Google Translate ocupado com outra tradução do mesmo par de idiomas")
+    try:
+        if iniciado is not None:
+            iniciado.set()
+        traducoes = tradutor.translate_batch(blocos)
+    finally:
+        trava.release()
+    return " ".join(t for t in traducoes if t), "Google Translate"
+
+
+def _traduzir_mymemory(texto: str, idioma_origem: str, idioma_destino: str) -> Tuple[str, str]:
+    """Traduz com MyMemory, em blocos de até LIMITE_CARACTERES_MYMEMORY caracteres"""
+    tradutor = MyMemoryTranslator(source=idioma_origem, target=idioma_destino)
+    traducoes = tradutor.translate_batch(dividir_texto(texto, LIMITE_CARACTERES_MYMEMORY))
+    return " ".join(t for t in traducoes if t), "MyMemory"
+
+
+def _traduzir(texto: str, idioma_origem: str, idioma_destino: str, alternativo: bool = True) -> Tuple[str, str]:
+    """
+    Traduz com Google Translate. Com `alternativo`, se o Google falhar, não
+    começar em ESPERA_ANTES_MYMEMORY segundos (trava ocupada por outra
+    tradução do mesmo par) ou não responder em ESPERA_ANTES_MYMEMORY segundos
+    por bloco depois de começar, dispara também o MyMemory e usa a primeira
+    tradução bem-sucedida. A outra termina em segundo plano e é ignorada.
+    Nenhuma espera passa de TEMPO_MAXIMO_TRADUCAO segundos por bloco; se ambos
+    falharem, relança o erro do Google (ou TimeoutError).
+    """
+    blocos = dividir_texto(texto, LIMITE_CARACTERES_GOOGLE)
+    prazo = TEMPO_MAXIMO_TRADUCAO * len(blocos)
+    iniciado = threading.Event()
+    google = _em_thread(_traduzir_google, blocos, idioma_origem, idioma_destino, iniciado)
+    if not alternativo:
+        # Até `prazo` pela trava (limitado em _traduzir_google) e `prazo` pela resposta
+        return google.result(timeout=2 * prazo)
+    
+    # O prazo do Google só começa a contar quando ele obtém a trava do par de
+    # idiomas, e não enquanto espera outra tradução do mesmo par terminar
+    if iniciado.wait(ESPERA_ANTES_MYMEMORY):
+        wait([google], timeout=ESPERA_ANTES_MYMEMORY * len(blocos))
+    if google.done() and google.exception() is None:
+        return google.result()
+    
+    limite = time.monotonic() + prazo
+    mymemory = _em_thread(_traduzir_mymemory, texto, idioma_origem, idioma_destino)
+    pendentes = {google, mymemory}
+    while pendentes:
+        concluidos, pendentes = wait(pendentes, timeout=limite - time.monotonic(), return_when=FIRST_COMPLETED)
+        if not concluidos:
+            break
+        for futuro in concluidos:
+            if futuro.exception() is None:
+                return futuro.result()
+    if google.done():
+        return google.result()
+    raise TimeoutError(f"Sem resposta dos serviços de tradução em {prazo:.0f} s")
+
+
+def traduzir_texto(texto: str, idioma_destino: str, idioma_origem: str, alternativo: bool = True):
+    """
+    Traduz texto usando Google Translate.
+    O idioma de origem é obrigatório: vem do idioma detectado pelo Whisper.
+    Traduções bem-sucedidas ficam em cache (chave: hash BLAKE2b do texto e
+    par de idiomas), então reprocessar o mesmo áudio não repete a chamada de rede.
+    Com alternativo=False, não recorre ao MyMemory (usado nas traduções parciais).
+    """
+    if not idioma_origem:
+        raise ValueError("O idioma de origem deve ser informado para a tradução")
+    
     if not texto or not texto.strip():
         return texto, "nenhum"
     
-    # Detecta idioma se não especificado
-    if not idioma_origem:
-        idioma_origem = detect(texto)
+    # Normaliza o texto para aumentar a taxa de acerto do cache
+    texto = texto.strip()
     
     # Verifica se já está no idioma desejado
     if idioma_origem == idioma_destino:
         return texto, "nenhum (mesma lingua)"
     
+    chave = chave_traducao(texto, idioma_origem, idioma_destino)
+    em_cache = _traducoes_cache.get(chave)
+    if em_cache is not None:
+        return em_cache
+    
     try:
-        tradutor = GoogleTranslator(source=idioma_origem, target=idioma_destino)
-        return tradutor.translate(texto), "Google Translate"
-    except Exception as e_google:
-        try:
-            tradutor = MyMemoryTranslator(source=idioma_origem, target=idioma_destino)
-            return tradutor.translate(texto), "MyMemory"
-        except Exception as e_mymemory:
-            return f"❌ Erro ao traduzir: {str(e_google)}", "erro"
+        resultado = _traduzir(texto, idioma_origem, idioma_destino, alternativo)
+    except Exception as e:
+        return f"❌ Erro ao traduzir: {str(e)}", "erro"
+    
+    # Textos longos não são cacheados para não inflar o uso de memória
+    if len(texto) <= LIMITE_TEXTO_CACHE:
+        _traducoes_cache.put(chave, resultado)
+    return resultado
+
 
+def progresso(segmento, duracao: float) -> str:
+    """Percentual do áudio já processado, a partir do fim do último segmento"""
+    if not duracao:
+        return ""
+    return f"({min(100, int(100 * segmento.end / duracao))}%)"
 
-def processar_audio(
+
+async def _iterar_segmentos(segmentos):
+    """Percorre o gerador de segmentos em uma thread, sem bloquear o loop de eventos"""
+    while True:
+        segmento = await asyncio.to_thread(next, segmentos, None)
+        if segmento is None:
+            return
+        yield segmento
+
+
+async def processar_audio(
     arquivo_audio,
     qualidade: str,
     idioma_origem: str,
     idioma_destino: str,
-    traduzir: bool
-) -> Tuple[str, str, str]:
-    """Processa áudio completo: transcrição e tradução"""
+    traduzir: bool,
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO
+) -> AsyncIterator[Tuple[str, str, str]]:
+    """
+    Processa áudio completo: transcrição e tradução.
+    Os resultados parciais são enviados à interface a cada segmento transcrito.
+    As etapas bloqueantes rodam em threads (asyncio.to_thread) para não
+    travar o loop de eventos do Gradio enquanto outros usuários são atendidos.
+    """
     
     if arquivo_audio is None:
-        return "❌ Nenhum arquivo foi enviado.", "", ""
+        yield "❌ Nenhum arquivo foi enviado.", "", ""
+        return
     
     try:
         # Converte qualidade para modelo Whisper
@@ -528,50 +708,277 @@ def processar_audio(
         codigo_idioma_origem = IDIOMAS.get(idioma_origem)
         
         # Transcreve
-        print(f"🎙️ Transcrevendo com modelo {modelo_whisper}...")
+        logger.info(f"🎙️ Transcrevendo com modelo {modelo_whisper}...")
         idioma_transcricao = None if codigo_idioma_origem == "auto" else codigo_idioma_origem
-        texto_transcrito, idioma_detectado = transcrever_audio(
+        segmentos, idioma_detectado, duracao = await asyncio.to_thread(
+            transcrever_segmentos,
             arquivo_audio,
             modelo_whisper,
-            idioma_transcricao
+            idioma_transcricao,
+            tamanho_lote
         )
         
-        print(f"✅ Transcrição concluída! Idioma: {idioma_detectado}")
+        nome_idioma = CODIGO_PARA_IDIOMA.get(idioma_detectado, idioma_detectado)
+        info = f"🌐 Idioma detectado: {nome_idioma}"
+        
+        # Áudio já no idioma de destino: nenhuma tradução (nem chamada de rede) é necessária
+        mesma_lingua = codigo_idioma_destino == idioma_detectado
+        # Para inglês, a tarefa "translate" do próprio Whisper substitui o Google Translate
+        traduzir_com_whisper = traduzir and not mesma_lingua and codigo_idioma_destino == "en"
+        traduzir_com_google = traduzir and not mesma_lingua and not traduzir_com_whisper
+        
+        # Envia o texto à interface conforme os segmentos ficam prontos.
+        # A cada SEGMENTOS_POR_TRADUCAO segmentos, só o trecho transcrito desde a
+        # última tradução parcial é traduzido, em segundo plano (uma por vez),
+        # e anexado à tradução: a transcrição não espera pelo Google Translate
+        texto_transcrito = ""
+        texto_traduzido = ""
+        total_segmentos = 0
+        traduzido_ate = 0
+        traducao_parcial = None
+        async for segmento in _iterar_segmentos(segmentos):
+            texto_transcrito += segmento.text
+            total_segmentos += 1
+            
+            if traducao_parcial is not None and traducao_parcial.done():
+                trecho_traduzido, servico = traducao_parcial.result()
+                if servico != "erro":
+                    texto_traduzido = f"{texto_traduzido} {trecho_traduzido}".strip()
+                traducao_parcial = None
+            
+            if (
+                traduzir_com_google
+                and traducao_parcial is None
+                and total_segmentos % SEGMENTOS_POR_TRADUCAO == 0
+            ):
+                # Sem o MyMemory: a parcial é provisória e não deve gastar a cota dele
+                traducao_parcial = asyncio.create_task(asyncio.to_thread(
+                    traduzir_texto,
+                    texto_transcrito[traduzido_ate:],
+                    codigo_idioma_destino,
+                    idioma_detectado,
+                    alternativo=False
+                ))
+                traduzido_ate = len(texto_transcrito)
+            
+            yield texto_transcrito.strip(), texto_traduzido, f"{info} {progresso(segmento, duracao)}"
+        
+        # A tradução final (do texto completo) substitui a parcial. A chamada
+        # em andamento não pode ser interrompida (roda em uma thread), então
+        # ela é aguardada para não disputar o tradutor com a tradução final
+        if traducao_parcial is not None:
+            await traducao_parcial
+        
+        texto_transcrito = texto_transcrito.strip()
+        logger.info(f"✅ Transcrição concluída! Idioma: {idioma_detectado}")
         
         # Traduz se solicitado
-        if traduzir:
-            print(f"🌍 Traduzindo para {idioma_destino}...")
-            texto_traduzido, servico = traduzir_texto(
+        if traduzir_com_whisper:
+            logger.info("🌍 Traduzindo para Inglês com o Whisper...")
+            segmentos_traducao, _, _ = await asyncio.to_thread(
+                transcrever_segmentos,
+                arquivo_audio,
+                modelo_whisper,
+                idioma_detectado,
+                tamanho_lote,
+                "translate"
+            )
+            
+            async for segmento in _iterar_segmentos(segmentos_traducao):
+                texto_traduzido += segmento.text
+                yield texto_transcrito, texto_traduzido.strip(), f"{info}\n🌍 Traduzindo... {progresso(segmento, duracao)}"
+            
+            texto_traduzido = texto_traduzido.strip()
+            servico = "Whisper (translate task)"
+            info = f"🌐 Idioma detectado: {nome_idioma}\n📝 Serviço de tradução: {servico}"
+        elif traduzir_com_google:
+            logger.info(f"🌍 Traduzindo para {idioma_destino}...")
+            texto_traduzido, servico = await asyncio.to_thread(
+                traduzir_texto,
                 texto_transcrito,
                 codigo_idioma_destino,
                 idioma_detectado
             )
             
-            nome_idioma = next((k for k, v in IDIOMAS.items() if v == idioma_detectado), idioma_detectado)
+            info = f"🌐 Idioma detectado: {nome_idioma}\n📝 Serviço de tradução: {servico}"
+        elif traduzir:
+            texto_traduzido = texto_transcrito
+            servico = "nenhum (mesma lingua)"
             info = f"🌐 Idioma detectado: {nome_idioma}\n📝 Serviço de tradução: {servico}"
         else:
             texto_traduzido = "✅ Tradução não solicitada."
-            nome_idioma = next((k for k, v in IDIOMAS.items() if v == idioma_detectado), idioma_detectado)
-            info = f"🌐 Idioma detectado: {nome_idioma}"
         
-        return texto_transcrito, texto_traduzido, info
+        yield texto_transcrito, texto_traduzido, info
         
     except Exception as e:
-        print(f"❌ Erro: {e}")
-        import traceback
-        traceback.print_exc()
-        return f"❌ Erro ao processar áudio: {str(e)}", "", ""
+        logger.exception(f"❌ Erro: {e}")
+        yield f"❌ Erro ao processar áudio: {str(e)}", "", ""
 
 
-def criar_interface():
-    """Cria a interface Gradio"""
+def iniciar_gravacao() -> Tuple[dict, str, str, str]:
+    """Começa uma gravação nova: estado vazio e caixas de resultado limpas"""
+    return novo_estado_microfone(), "", "", ""
+
+
+def texto_microfone(estado: dict) -> str:
+    """Transcrição exibida durante a gravação (avisa quando o limite é atingido)"""
+    texto = (estado["texto"] + estado["parcial"]).strip()
+    if estado["amostras_gravadas"] >= DURACAO_MAXIMA_GRAVACAO * TAXA_AMOSTRAGEM:
+        texto += f"\n\n⚠️ Gravação limitada a {DURACAO_MAXIMA_GRAVACAO // 60} minutos: o restante foi descartado."
+    return texto
+
+
+def processar_trecho_microfone(
+    trecho,
+    estado: dict,
+    qualidade: str,
+    idioma_origem: str,
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO
+) -> Tuple[str, dict]:
+    """
+    Recebe os trechos do microfone durante a gravação e transcreve uma janela
+    deslizante de até JANELA_MICROFONE segundos. A transcrição provisória é
+    atualizada a cada segundo de áudio novo; ao completar a janela, o texto é
+    consolidado e uma nova janela começa. Gravações acima de
+    DURACAO_MAXIMA_GRAVACAO segundos são truncadas.
+    Trechos da mesma gravação são processados um de cada vez, pela trava
+    guardada no próprio estado.
+    """
+    if estado is None:
+        estado = novo_estado_microfone()
+    with estado["trava"]:
+        if trecho is None:
+            return texto_microfone(estado), estado
+        
+        adicionar_trecho(estado, converter_para_16k(*trecho), DURACAO_MAXIMA_GRAVACAO * TAXA_AMOSTRAGEM)
+        
+        pendente = janela_pendente(estado, JANELA_MICROFONE * TAXA_AMOSTRAGEM)
+        if pendente is not None:
+            audio, janela_completa = pendente
+            codigo_idioma_origem = IDIOMAS.get(idioma_origem)
+            idioma_transcricao = None if codigo_idioma_origem == "auto" else codigo_idioma_origem
+            texto_janela, _ = transcrever_audio(
+                audio,
+                QUALIDADE_PARA_MODELO[qualidade],
+                idioma_transcricao,
+                tamanho_lote
+            )
+            registrar_janela(estado, texto_janela, janela_completa)
+        
+        return texto_microfone(estado), estado
+
+
+async def processar_gravacao(
+    estado: dict,
+    qualidade: str,
+    idioma_origem: str,
+    idioma_destino: str,
+    traduzir: bool,
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO
+) -> AsyncIterator[Tuple[str, str, str]]:
+    """Processa a gravação completa (transcrição final e tradução)"""
+    if not estado or not estado["gravacao"]:
+        yield "❌ Nenhuma gravação detectada.", "", ""
+        return
     
-    tema = gr.themes.Soft(
-        primary_hue="blue",
-        secondary_hue="cyan",
+    with estado["trava"]:
+        audio = np.concatenate(estado["gravacao"])
+    async for resultado in processar_audio(audio, qualidade, idioma_origem, idioma_destino, traduzir, tamanho_lote):
+        yield resultado
+
+
+# Tema da interface (criado uma única vez, na importação)
+TEMA = gr.themes.Soft(
+    primary_hue="blue",
+    secondary_hue="cyan",
+)
+
+
+def _criar_controles():
+    """
+    Cria os controles de configuração comuns às abas de upload e microfone.
+    Deve ser chamada dentro do contexto (gr.Column) onde os controles aparecem.
+    
+    Returns:
+        Tuple (qualidade, idioma de origem, idioma de destino, traduzir, tamanho do lote)
+    """
+    qualidade = gr.Radio(
+        choices=_QUALIDADES,
+        value="Balanceada",
+        label="Nível de Qualidade da Transcrição",
+        info="Quanto maior a qualidade, mais lenta e precisa será a transcrição"
+    )
+    
+    idioma_origem = gr.Dropdown(
+        choices=_IDIOMAS_KEYS,
+        value="Detecção Automática",
+        label="Idioma do Áudio (Opcional)",
+        info="Deixe em 'Detecção Automática' se não souber o idioma"
+    )
+    
+    idioma_destino = gr.Dropdown(
+        choices=_IDIOMAS_DESTINO_KEYS,
+        value="Português",
+        label="Idioma de Destino para Tradução",
+        info="Idioma para o qual o texto será traduzido"
+    )
+    
+    traduzir = gr.Checkbox(
+        value=True,
+        label="Traduzir texto transcrito",
+        info="Desmarque para apenas transcrever (sem tradução)"
+    )
+    
+    tamanho_lote = gr.Slider(
+        minimum=1,
+        maximum=TAMANHO_LOTE_MAXIMO,
+        value=TAMANHO_LOTE_PADRAO,
+        step=1,
+        label="Tamanho do Lote",
+        info="Trechos de áudio transcritos em paralelo (valores maiores usam mais memória RAM)"
     )
     
-    with gr.Blocks(theme=tema, title="Transcrição e Tradução de Áudio") as interface:
+    return qualidade, idioma_origem, idioma_destino, traduzir, tamanho_lote
+
+
+def _criar_saidas():
+    """
+    Cria as caixas de resultado comuns às abas de upload e microfone.
+    
+    Returns:
+        Tuple (texto transcrito, texto traduzido, informações)
+    """
+    transcricao = gr.Textbox(
+        label="📝 Texto Transcrito",
+        lines=8,
+        max_lines=15,
+        show_copy_button=True
+    )
+    
+    traducao = gr.Textbox(
+        label="🌍 Texto Traduzido",
+        lines=8,
+        max_lines=15,
+        show_copy_button=True
+    )
+    
+    info = gr.Textbox(
+        label="ℹ️ Informações",
+        lines=2
+    )
+    
+    return transcricao, traducao, info
+
+
+def criar_interface():
+    """Cria a interface Gradio"""
+    
+    # analytics_enabled=False: sem requisições de telemetria do Gradio ao iniciar
+    with gr.Blocks(
+        theme=TEMA,
+        title="Transcrição e Tradução de Áudio",
+        analytics_enabled=False
+    ) as interface:
         
         gr.HTML("""
         <div style="text-align: center; width: 100%; margin: 20px auto;">
@@ -601,32 +1008,7 @@ def criar_interface():
                             sources=["upload"]
                         )
                         
-                        qualidade = gr.Radio(
-                            choices=["Muito Rápida", "Rápida", "Balanceada", "Alta Qualidade", "Máxima Qualidade"],
-                            value="Balanceada",
-                            label="Nível de Qualidade da Transcrição",
-                            info="Quanto maior a qualidade, mais lenta e precisa será a transcrição"
-                        )
-                        
-                        idioma_origem = gr.Dropdown(
-                            choices=list(IDIOMAS.keys()),
-                            value="Detecção Automática",
-                            label="Idioma do Áudio (Opcional)",
-                            info="Deixe em 'Detecção Automática' se não souber o idioma"
-                        )
-                        
-                        idioma_destino = gr.Dropdown(
-                            choices=list(IDIOMAS_DESTINO.keys()),
-                            value="Português",
-                            label="Idioma de Destino para Tradução",
-                            info="Idioma para o qual o texto será traduzido"
-                        )
-                        
-                        traduzir = gr.Checkbox(
-                            value=True,
-                            label="Traduzir texto transcrito",
-                            info="Desmarque para apenas transcrever (sem tradução)"
-                        )
+                        qualidade, idioma_origem, idioma_destino, traduzir, tamanho_lote = _criar_controles()
                         
                         btn_processar = gr.Button(
                             "🚀 Processar Arquivo",
@@ -635,28 +1017,11 @@ def criar_interface():
                         )
                     
                     with gr.Column(scale=1):
-                        transcricao = gr.Textbox(
-                            label="📝 Texto Transcrito",
-                            lines=8,
-                            max_lines=15,
-                            show_copy_button=True
-                        )
-                        
-                        traducao = gr.Textbox(
-                            label="🌍 Texto Traduzido",
-                            lines=8,
-                            max_lines=15,
-                            show_copy_button=True
-                        )
-                        
-                        info = gr.Textbox(
-                            label="ℹ️ Informações",
-                            lines=2
-                        )
+                        transcricao, traducao, info = _criar_saidas()
                 
                 btn_processar.click(
                     fn=processar_audio,
-                    inputs=[arquivo_input, qualidade, idioma_origem, idioma_destino, traduzir],
+                    inputs=[arquivo_input, qualidade, idioma_origem, idioma_destino, traduzir, tamanho_lote],
                     outputs=[transcricao, traducao, info]
                 )
             
@@ -666,45 +1031,23 @@ def criar_interface():
                 gr.Markdown("""
                 **📝 Como usar:**
                 1. Clique no ícone do microfone para começar a gravar
-                2. Fale claramente
+                2. Fale claramente (a transcrição aparece enquanto você fala)
                 3. Clique novamente para parar a gravação
-                4. Clique no botão "🚀 Processar Gravação"
+                4. Clique no botão "🚀 Processar Gravação" para a transcrição final e a tradução
                 """)
                 
+                estado_mic = gr.State(None)
+                
                 with gr.Row():
                     with gr.Column(scale=1):
                         microfone_input = gr.Audio(
                             label="Gravação de Áudio",
-                            type="filepath",
-                            sources=["microphone"]
-                        )
-                        
-                        qualidade_mic = gr.Radio(
-                            choices=["Muito Rápida", "Rápida", "Balanceada", "Alta Qualidade", "Máxima Qualidade"],
-                            value="Balanceada",
-                            label="Nível de Qualidade da Transcrição",
-                            info="Quanto maior a qualidade, mais lenta e precisa será a transcrição"
-                        )
-                        
-                        idioma_origem_mic = gr.Dropdown(
-                            choices=list(IDIOMAS.keys()),
-                            value="Detecção Automática",
-                            label="Idioma do Áudio (Opcional)",
-                            info="Deixe em 'Detecção Automática' se não souber o idioma"
-                        )
-                        
-                        idioma_destino_mic = gr.Dropdown(
-                            choices=list(IDIOMAS_DESTINO.keys()),
-                            value="Português",
-                            label="Idioma de Destino para Tradução",
-                            info="Idioma para o qual o texto será traduzido"
+                            type="numpy",
+                            sources=["microphone"],
+                            streaming=True
                         )
                         
-                        traduzir_mic = gr.Checkbox(
-                            value=True,
-                            label="Traduzir texto transcrito",
-                            info="Desmarque para apenas transcrever (sem tradução)"
-                        )
+                        qualidade_mic, idioma_origem_mic, idioma_destino_mic, traduzir_mic, tamanho_lote_mic = _criar_controles()
                         
                         btn_processar_mic = gr.Button(
                             "🚀 Processar Gravação",
@@ -713,28 +1056,27 @@ def criar_interface():
                         )
                     
                     with gr.Column(scale=1):
-                        transcricao_mic = gr.Textbox(
-                            label="📝 Texto Transcrito",
-                            lines=8,
-                            max_lines=15,
-                            show_copy_button=True
-                        )
-                        
-                        traducao_mic = gr.Textbox(
-                            label="🌍 Texto Traduzido",
-                            lines=8,
-                            max_lines=15,
-                            show_copy_button=True
-                        )
-                        
-                        info_mic = gr.Textbox(
-                            label="ℹ️ Informações",
-                            lines=2
-                        )
+                        transcricao_mic, traducao_mic, info_mic = _criar_saidas()
+                
+                # Uma nova gravação descarta o áudio e os resultados da anterior
+                microfone_input.start_recording(
+                    fn=iniciar_gravacao,
+                    outputs=[estado_mic, transcricao_mic, traducao_mic, info_mic]
+                )
+                
+                # Gravações de sessões diferentes são transcritas em paralelo; dentro
+                # de uma sessão, a trava do estado processa um trecho por vez
+                microfone_input.stream(
+                    fn=processar_trecho_microfone,
+                    inputs=[microfone_input, estado_mic, qualidade_mic, idioma_origem_mic, tamanho_lote_mic],
+                    outputs=[transcricao_mic, estado_mic],
+                    trigger_mode="multiple",
+                    show_progress="hidden"
+                )
                 
                 btn_processar_mic.click(
-                    fn=processar_audio,
-                    inputs=[microfone_input, qualidade_mic, idioma_origem_mic, idioma_destino_mic, traduzir_mic],
+                    fn=processar_gravacao,
+                    inputs=[estado_mic, qualidade_mic, idioma_origem_mic, idioma_destino_mic, traduzir_mic, tamanho_lote_mic],
                     outputs=[transcricao_mic, traducao_mic, info_mic]
                 )
         
@@ -748,17 +1090,39 @@ def criar_interface():
         </div>
         """)
     
+    # Cada evento atende até NUM_WORKERS requisições ao mesmo tempo (o padrão
+    # do Gradio é uma); a inferência em si continua limitada pelo semáforo.
+    # Acima de TAMANHO_MAXIMO_FILA pedidos em espera, novos são recusados.
+    interface.queue(max_size=TAMANHO_MAXIMO_FILA, default_concurrency_limit=NUM_WORKERS)
+    
     return interface
 
 
 if __name__ == "__main__":
-    print("🚀 Iniciando Sistema de Transcrição e Tradução...")
-    
+    logger.info("🚀 Iniciando Sistema de Transcrição e Tradução...")
+    compute_type = COMPUTE_TYPE_GPU if DISPOSITIVO == "cuda" else COMPUTE_TYPE_CPU
+    logger.info(f"🖥️ Dispositivo: {DISPOSITIVO} ({compute_type})")
+
     # Detecta se está no Hugging Face Spaces
     is_spaces = os.getenv("SPACE_ID") is not None
     
     interface = criar_interface()
     
+    # Pré-carrega o modelo padrão (e os menores, se houver RAM sobrando) para
+    # que a primeira requisição não pague o custo de carregamento
+    # (o padrão é carregado por último para ser o mais recente no cache LRU).
+    # Roda em segundo plano para não atrasar a abertura da interface; uma
+    # requisição que chegue antes aguarda o carregamento na trava do cache.
+    qualidades_extras = []
+    if memoria_total_gb() >= 8:
+        qualidades_extras = ["Muito Rápida", "Rápida"][:_modelos_cache.capacidade - 1]
+    threading.Thread(
+        target=aquecer_modelos,
+        args=([QUALIDADE_PARA_MODELO[q] for q in qualidades_extras + ["Balanceada"]],),
+        name="aquecimento",
+        daemon=True
+    ).start()
+    
     if is_spaces:
         # No Hugging Face Spaces
         interface.launch(server_name="0.0.0.0", server_port=7860)
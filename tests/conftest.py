@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Permite importar os módulos do app (na raiz do repositório) nos testes
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,66 @@
+"""
+Testes do cache LRU com validade usado para transcrições e traduções.
+"""
+
+from utilidades import CacheLRU
+
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+def test_descarta_o_menos_usado_ao_atingir_a_capacidade():
+    cache = CacheLRU(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_regravar_chave_nao_aumenta_o_cache():
+    cache = CacheLRU(2)
+    cache.put("a", 1)
+    cache.put("a", 2)
+
+    assert len(cache) == 1
+    assert cache.get("a") == 2
+
+
+def test_entrada_expira_apos_a_validade():
+    relogio = RelogioFalso()
+    cache = CacheLRU(4, validade=60, relogio=relogio)
+    cache.put("a", 1)
+
+    relogio.agora = 60
+    assert cache.get("a") == 1
+
+    relogio.agora = 61
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_sem_validade_nao_expira():
+    relogio = RelogioFalso()
+    cache = CacheLRU(4, relogio=relogio)
+    cache.put("a", 1)
+
+    relogio.agora = 10 ** 9
+    assert cache.get("a") == 1
+
+
+def test_capacidade_minima_e_um():
+    cache = CacheLRU(0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert len(cache) == 1
+    assert cache.get("b") == 2
@@ -0,0 +1,34 @@
+"""
+Testes da chave do cache de traduções.
+"""
+
+from utilidades import CacheLRU, chave_traducao
+
+
+def test_espacos_nas_pontas_nao_mudam_a_chave():
+    assert chave_traducao("  Olá mundo. ", "pt", "en") == chave_traducao("Olá mundo.", "pt", "en")
+
+
+def test_par_de_idiomas_faz_parte_da_chave():
+    assert chave_traducao("Olá", "pt", "en") != chave_traducao("Olá", "pt", "es")
+    assert chave_traducao("Olá", "pt", "en") != chave_traducao("Olá", "es", "en")
+
+
+def test_textos_diferentes_geram_chaves_diferentes():
+    assert chave_traducao("Olá", "pt", "en") != chave_traducao("Olá!", "pt", "en")
+
+
+def test_chave_guarda_so_o_hash_do_texto():
+    digest, origem, destino = chave_traducao("texto longo " * 100, "pt", "en")
+
+    assert len(digest) == 16
+    assert (origem, destino) == ("pt", "en")
+
+
+def test_cache_de_traducoes_descarta_a_mais_antiga():
+    cache = CacheLRU(2)
+    for texto in ("um", "dois", "três"):
+        cache.put(chave_traducao(texto, "pt", "en"), (texto.upper(), "Google Translate"))
+
+    assert cache.get(chave_traducao("um", "pt", "en")) is None
+    assert cache.get(chave_traducao("três", "pt", "en")) == ("TRÊS", "Google Translate")
@@ -0,0 +1,30 @@
+"""
+Testes da conversão entre os códigos de idioma do Whisper e os da interface.
+"""
+
+from utilidades import codigo_do_whisper, codigo_para_whisper
+
+
+def test_codigos_divergentes_do_whisper():
+    assert codigo_do_whisper("zh") == "zh-CN"
+    assert codigo_do_whisper("he") == "iw"
+
+
+def test_codigos_da_interface_para_o_whisper():
+    assert codigo_para_whisper("zh-CN") == "zh"
+    assert codigo_para_whisper("iw") == "he"
+
+
+def test_codigos_iguais_passam_direto():
+    for codigo in ("pt", "en", "es", "ja"):
+        assert codigo_do_whisper(codigo) == codigo
+        assert codigo_para_whisper(codigo) == codigo
+
+
+def test_ida_e_volta():
+    for codigo in ("zh", "he", "pt"):
+        assert codigo_para_whisper(codigo_do_whisper(codigo)) == codigo
+
+
+def test_idioma_nao_detectado():
+    assert codigo_do_whisper(None) is None
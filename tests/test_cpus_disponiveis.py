@@ -0,0 +1,50 @@
+"""
+Testes da detecção de CPUs disponíveis (afinidade, cota do cgroup e WHISPER_CPUS).
+"""
+
+import os
+
+import pytest
+
+from utilidades import cpus_disponiveis
+
+
+@pytest.fixture(autouse=True)
+def oito_cpus(monkeypatch):
+    monkeypatch.delenv("WHISPER_CPUS", raising=False)
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(8)), raising=False)
+
+
+def cpu_max(tmp_path, conteudo):
+    caminho = tmp_path / "cpu.max"
+    caminho.write_text(conteudo)
+    return str(caminho)
+
+
+def test_sem_cota_usa_a_afinidade(tmp_path):
+    assert cpus_disponiveis(cpu_max(tmp_path, "max 100000\n")) == 8
+
+
+def test_cota_limita_as_cpus(tmp_path):
+    assert cpus_disponiveis(cpu_max(tmp_path, "200000 100000\n")) == 2
+
+
+def test_cota_fracionaria_garante_uma_cpu(tmp_path):
+    assert cpus_disponiveis(cpu_max(tmp_path, "50000 100000\n")) == 1
+
+
+def test_cota_maior_que_a_afinidade_nao_aumenta(tmp_path):
+    assert cpus_disponiveis(cpu_max(tmp_path, "1600000 100000\n")) == 8
+
+
+def test_arquivo_ausente_ou_invalido(tmp_path):
+    assert cpus_disponiveis(str(tmp_path / "inexistente")) == 8
+    assert cpus_disponiveis(cpu_max(tmp_path, "lixo\n")) == 8
+
+
+def test_whisper_cpus_tem_prioridade(tmp_path, monkeypatch):
+    monkeypatch.setenv("WHISPER_CPUS", "3")
+    assert cpus_disponiveis(cpu_max(tmp_path, "100000 100000\n")) == 3
+
+    monkeypatch.setenv("WHISPER_CPUS", "0")
+    assert cpus_disponiveis() == 1
@@ -0,0 +1,23 @@
+"""
+Testes da divisão de textos longos em blocos para os serviços de tradução.
+"""
+
+from utilidades import dividir_texto
+
+
+def test_frase_longa_apos_frase_curta_mantem_ordem():
+    texto = "Primeira frase curta. " + " ".join(f"palavra{i}" for i in range(120)) + ". Fim."
+
+    blocos = dividir_texto(texto, 500)
+
+    assert " ".join(blocos) == texto
+    assert all(len(bloco) <= 500 for bloco in blocos)
+
+
+def test_texto_sem_espacos_respeita_limite():
+    texto = "字" * 1200
+
+    blocos = dividir_texto(texto, 500)
+
+    assert "".join(blocos) == texto
+    assert all(len(bloco) <= 500 for bloco in blocos)
@@ -0,0 +1,89 @@
+"""
+Testes da conversão do áudio do microfone e da janela de transcrição ao vivo.
+"""
+
+import numpy as np
+
+from utilidades import (
+    TAXA_AMOSTRAGEM,
+    adicionar_trecho,
+    converter_para_16k,
+    janela_pendente,
+    novo_estado_microfone,
+    registrar_janela,
+)
+
+JANELA = 5 * TAXA_AMOSTRAGEM
+LIMITE = 60 * TAXA_AMOSTRAGEM
+
+
+def silencio(segundos):
+    return np.zeros(int(segundos * TAXA_AMOSTRAGEM), dtype=np.float32)
+
+
+def test_reamostragem_para_16k():
+    assert len(converter_para_16k(48000, np.zeros(48000, dtype=np.int16))) == TAXA_AMOSTRAGEM
+    assert len(converter_para_16k(44100, np.zeros(44100 // 2, dtype=np.int16))) == TAXA_AMOSTRAGEM // 2
+
+
+def test_16k_mantem_as_amostras():
+    dados = np.array([0, 16384, -32768], dtype=np.int16)
+
+    audio = converter_para_16k(TAXA_AMOSTRAGEM, dados)
+
+    assert audio.dtype == np.float32
+    np.testing.assert_allclose(audio, [0.0, 0.5, -1.0])
+
+
+def test_estereo_vira_mono():
+    dados = np.array([[16384, -16384], [16384, 16384], [0, 32766]], dtype=np.int16)
+
+    audio = converter_para_16k(TAXA_AMOSTRAGEM, dados)
+
+    assert audio.shape == (3,)
+    np.testing.assert_allclose(audio, [0.0, 0.5, 0.5], atol=1e-4)
+
+
+def test_trecho_vazio():
+    assert len(converter_para_16k(48000, np.zeros((0, 2), dtype=np.int16))) == 0
+
+
+def test_transcreve_a_cada_segundo_de_audio_novo():
+    estado = novo_estado_microfone()
+
+    adicionar_trecho(estado, silencio(0.5), LIMITE)
+    assert janela_pendente(estado, JANELA) is None
+
+    adicionar_trecho(estado, silencio(0.5), LIMITE)
+    audio, completa = janela_pendente(estado, JANELA)
+    assert len(audio) == TAXA_AMOSTRAGEM and not completa
+
+    registrar_janela(estado, "olá", completa)
+    assert estado["parcial"] == " olá"
+    adicionar_trecho(estado, silencio(0.5), LIMITE)
+    assert janela_pendente(estado, JANELA) is None
+
+
+def test_janela_completa_consolida_e_recomeca():
+    estado = novo_estado_microfone()
+    for _ in range(5):
+        adicionar_trecho(estado, silencio(1), LIMITE)
+        audio, completa = janela_pendente(estado, JANELA)
+        registrar_janela(estado, "texto", completa)
+
+    assert completa and len(audio) == JANELA
+    assert estado["texto"] == " texto" and estado["parcial"] == ""
+    assert estado["amostras_janela"] == 0 and not estado["janela"]
+    assert len(estado["gravacao"]) == 5
+
+
+def test_gravacao_truncada_no_limite():
+    estado = novo_estado_microfone()
+
+    adicionar_trecho(estado, silencio(0.75), TAXA_AMOSTRAGEM)
+    adicionar_trecho(estado, silencio(0.75), TAXA_AMOSTRAGEM)
+    adicionar_trecho(estado, silencio(0.75), TAXA_AMOSTRAGEM)
+
+    assert estado["amostras_gravadas"] == TAXA_AMOSTRAGEM
+    assert sum(len(trecho) for trecho in estado["gravacao"]) == TAXA_AMOSTRAGEM
+    assert len(estado["gravacao"]) == 2
@@ -0,0 +1,204 @@
+"""
+Funções auxiliares do sistema de transcrição e tradução
+=======================================================
+Lógica pura (apenas NumPy), sem dependência do Gradio, do Whisper ou dos
+serviços de tradução, para que possa ser testada isoladamente.
+
+Autor: João Vítor Arruda Percinotto
+TCC: USO DE TRANSCRIÇÃO DE ÁUDIO PARA TRADUÇÃO DINÂMICA DE IDIOMAS COM MODELOS DE IA LLM
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from types import MappingProxyType
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Taxa de amostragem esperada pelo Whisper
+TAXA_AMOSTRAGEM = 16000
+
+# Fim de frase (pontuação seguida de espaço), usado para dividir textos longos
+_SEPARADOR_FRASES = re.compile(r'(?<=[.!?])\s+')
+
+# Códigos do Whisper que diferem dos usados em IDIOMAS e pelo Google Translate
+CODIGO_WHISPER_PARA_IDIOMA = MappingProxyType({"zh": "zh-CN", "he": "iw"})
+CODIGO_IDIOMA_PARA_WHISPER = MappingProxyType({v: k for k, v in CODIGO_WHISPER_PARA_IDIOMA.items()})
+
+
+class CacheLRU:
+    """
+    Cache LRU seguro entre threads, limitado a `capacidade` entradas.
+    Com `validade` (em segundos), entradas mais antigas que isso expiram.
+    """
+    
+    def __init__(self, capacidade: int, validade: float = None, relogio=time.monotonic):
+        self.capacidade = max(1, capacidade)
+        self.validade = validade
+        self._relogio = relogio
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._itens)
+    
+    def get(self, chave):
+        """Retorna o valor (ou None, se ausente ou expirado) e o marca como o mais recente"""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            instante, valor = item
+            if self.validade is not None and self._relogio() - instante > self.validade:
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return valor
+    
+    def put(self, chave, valor):
+        """Adiciona o valor ao cache, descartando o mais antigo se necessário"""
+        with self._lock:
+            self._itens[chave] = (self._relogio(), valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+
+
+def chave_traducao(texto: str, idioma_origem: str, idioma_destino: str) -> tuple:
+    """
+    Chave do cache de traduções: hash BLAKE2b (16 bytes) do texto sem espaços
+    nas pontas e o par de idiomas. O texto em si não fica retido no cache.
+    """
+    return hashlib.blake2b(texto.strip().encode(), digest_size=16).digest(), idioma_origem, idioma_destino
+
+
+def cpus_disponiveis(caminho_cpu_max: str = "/sys/fs/cgroup/cpu.max") -> int:
+    """
+    Retorna quantas CPUs o processo pode usar (WHISPER_CPUS força o valor).
+    Considera a afinidade do processo e a cota do cgroup (cpu.max), já que
+    em containers (ex.: Hugging Face Spaces) os.cpu_count() informa os
+    núcleos da máquina hospedeira, e não os alocados.
+    """
+    if os.getenv("WHISPER_CPUS"):
+        return max(1, int(os.getenv("WHISPER_CPUS")))
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open(caminho_cpu_max) as arquivo:
+            cota, periodo = arquivo.read().split()
+        if cota != "max":
+            cpus = min(cpus, max(1, int(cota) // int(periodo)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def codigo_do_whisper(codigo):
+    """Converte o código de idioma detectado pelo Whisper para o usado em IDIOMAS."""
+    return CODIGO_WHISPER_PARA_IDIOMA.get(codigo, codigo)
+
+
+def codigo_para_whisper(codigo):
+    """Converte um código de IDIOMAS para o código aceito pelo Whisper."""
+    return CODIGO_IDIOMA_PARA_WHISPER.get(codigo, codigo)
+
+
+def dividir_texto(texto: str, limite: int) -> List[str]:
+    """
+    Divide o texto em blocos de até `limite` caracteres, quebrando
+    preferencialmente no fim das frases (e, se preciso, entre palavras).
+    """
+    blocos = []
+    atual = ""
+    for frase in _SEPARADOR_FRASES.split(texto.strip()):
+        # Frases maiores que o limite são cortadas no último espaço possível;
+        # o bloco pendente sai antes dos pedaços para preservar a ordem
+        if len(frase) > limite and atual:
+            blocos.append(atual)
+            atual = ""
+        while len(frase) > limite:
+            corte = frase.rfind(" ", 0, limite)
+            if corte <= 0:
+                corte = limite
+            blocos.append(frase[:corte].strip())
+            frase = frase[corte:].strip()
+        
+        if atual and len(atual) + 1 + len(frase) > limite:
+            blocos.append(atual)
+            atual = frase
+        else:
+            atual = f"{atual} {frase}" if atual else frase
+    
+    if atual:
+        blocos.append(atual)
+    return blocos
+
+
+def converter_para_16k(taxa: int, dados: np.ndarray) -> np.ndarray:
+    """Converte áudio PCM int16 do Gradio (amostras x canais) para float32 mono a 16 kHz"""
+    audio = dados.astype(np.float32) / 32768.0
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    if taxa != TAXA_AMOSTRAGEM and len(audio) > 0:
+        # Interpolação linear: suficiente para voz e sem dependências extras
+        total = int(round(len(audio) * TAXA_AMOSTRAGEM / taxa))
+        posicoes = np.linspace(0, len(audio) - 1, total)
+        audio = np.interp(posicoes, np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+
+def novo_estado_microfone() -> dict:
+    """Estado de uma gravação em andamento (um por sessão do navegador)"""
+    return {
+        "gravacao": [],       # todos os trechos recebidos (para o processamento final)
+        "amostras_gravadas": 0,
+        "janela": deque(),    # trechos ainda não consolidados na transcrição
+        "amostras_janela": 0,
+        "amostras_transcritas": 0,
+        "texto": "",          # texto das janelas já consolidadas
+        "parcial": "",        # transcrição provisória da janela atual
+        "trava": threading.Lock()  # um trecho por vez dentro da mesma gravação
+    }
+
+
+def adicionar_trecho(estado: dict, amostras: np.ndarray, limite_amostras: int):
+    """Acrescenta o trecho à gravação e à janela, descartando o que passar do limite"""
+    amostras = amostras[:max(0, limite_amostras - estado["amostras_gravadas"])]
+    if len(amostras) == 0:
+        return
+    estado["gravacao"].append(amostras)
+    estado["amostras_gravadas"] += len(amostras)
+    estado["janela"].append(amostras)
+    estado["amostras_janela"] += len(amostras)
+
+
+def janela_pendente(estado: dict, amostras_janela: int) -> Optional[Tuple[np.ndarray, bool]]:
+    """
+    Retorna (áudio da janela, janela completa) quando há algo a transcrever:
+    a janela atingiu `amostras_janela` ou chegou ao menos 1 s de áudio novo.
+    Caso contrário, retorna None.
+    """
+    completa = estado["amostras_janela"] >= amostras_janela
+    audio_novo = estado["amostras_janela"] - estado["amostras_transcritas"]
+    if not completa and audio_novo < TAXA_AMOSTRAGEM:
+        return None
+    return np.concatenate(estado["janela"]), completa
+
+
+def registrar_janela(estado: dict, texto: str, completa: bool):
+    """Consolida o texto de uma janela completa ou atualiza a transcrição provisória"""
+    if completa:
+        estado["texto"] += " " + texto
+        estado["parcial"] = ""
+        estado["janela"].clear()
+        estado["amostras_janela"] = 0
+        estado["amostras_transcritas"] = 0
+    else:
+        estado["parcial"] = " " + texto
+        estado["amostras_transcritas"] = estado["amostras_janela"]